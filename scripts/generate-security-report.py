@@ -4,25 +4,231 @@ Security Report Generator for CodePal
 Consolidates all security and compliance scan results into comprehensive reports
 """
 
+import hashlib
 import json
 import os
 import sys
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
-import yaml
-from jinja2 import Template
+from typing import TYPE_CHECKING, Callable, Dict, List, Set, Tuple, Union, Any
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+# Optional accelerators and weasyprint ship without type information; mypy
+# reports them as untyped or missing depending on what is installed
+try:
+    import cysimdjson  # type: ignore[import-untyped, import-not-found, unused-ignore]
+except ImportError:
+    cysimdjson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Parser objects are reusable but a parsed document is only valid until the
+# next parse, so each loader thread keeps its own parser
+_thread_state = threading.local()
+
+
+def _export(value: Any) -> Any:
+    """Convert a cysimdjson view into plain Python objects for serialization"""
+    return value.export() if hasattr(value, "export") else value
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize report data, including Finding objects, to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=asdict).encode()
+
+
+def _loads(raw: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _parse_json(raw: bytes) -> Any:
+    """Parse the raw bytes of a JSON scan artifact, preferring cysimdjson, then orjson"""
+    # Parse raw bytes directly rather than decoding through a text file first
+    if cysimdjson is not None:
+        parser = getattr(_thread_state, "parser", None)
+        if parser is None:
+            parser = _thread_state.parser = cysimdjson.JSONParser()
+        return parser.parse(raw)
+    return _loads(raw)
+
+
+# Cached findings are only valid for the parsing code that produced them
+_SCRIPT_DIGEST = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=8).hexdigest()
+
+# The document head and stylesheet never change, so they are written as-is
+# and only the report body goes through Jinja
+_HTML_PREFIX = b"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>CodePal Security Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .header { background: #f5f5f5; padding: 20px; border-radius: 5px; }
+        .summary { display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px; margin: 20px 0; }
+        .summary-card { background: #fff; padding: 20px; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .critical { border-left: 5px solid #dc3545; }
+        .high { border-left: 5px solid #fd7e14; }
+        .medium { border-left: 5px solid #ffc107; }
+        .low { border-left: 5px solid #28a745; }
+        .findings { margin: 20px 0; }
+        .finding { background: #fff; padding: 15px; margin: 10px 0; border-radius: 5px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }
+        .recommendations { background: #e7f3ff; padding: 20px; border-radius: 5px; margin: 20px 0; }
+        .compliance { background: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0; }
+    </style>
+</head>
+<body>
+"""
+
+_HTML_BODY_SOURCE = """    <div class="header">
+        <h1>🔒 CodePal Security Report</h1>
+        <p>Generated on: {{ scan_metadata.generated_at }}</p>
+        <p>Project: {{ scan_metadata.project }} v{{ scan_metadata.version }}</p>
+    </div>
+    
+    <div class="summary">
+        <div class="summary-card critical">
+            <h3>Critical</h3>
+            <h2>{{ summary.critical }}</h2>
+        </div>
+        <div class="summary-card high">
+            <h3>High</h3>
+            <h2>{{ summary.high }}</h2>
+        </div>
+        <div class="summary-card medium">
+            <h3>Medium</h3>
+            <h2>{{ summary.medium }}</h2>
+        </div>
+        <div class="summary-card low">
+            <h3>Low</h3>
+            <h2>{{ summary.low }}</h2>
+        </div>
+    </div>
+    
+    <div class="compliance">
+        <h2>Compliance Status</h2>
+        <p><strong>Overall Status:</strong> {{ compliance_status.overall_status }}</p>
+        {% for standard, status in compliance_status.standards.items() %}
+        <p><strong>{{ standard }}:</strong> {{ status }}</p>
+        {% endfor %}
+    </div>
+    
+    <div class="findings">
+        <h2>Security Findings</h2>
+        {% for finding in findings %}
+        <div class="finding {{ finding.severity.lower() }}">
+            <h4>{{ finding.title }}</h4>
+            <p><strong>Severity:</strong> {{ finding.severity }}</p>
+            <p><strong>Category:</strong> {{ finding.category }}</p>
+            <p><strong>Tool:</strong> {{ finding.tool }}</p>
+            <p>{{ finding.description }}</p>
+        </div>
+        {% endfor %}
+    </div>
+    
+    <div class="recommendations">
+        <h2>Recommendations</h2>
+        <ul>
+        {% for recommendation in recommendations %}
+            <li>{{ recommendation }}</li>
+        {% endfor %}
+        </ul>
+    </div>"""
+
+_HTML_SUFFIX = b"""
+</body>
+</html>"""
+
+
+@lru_cache(maxsize=None)
+def _jinja_env() -> "Environment":
+    """Create the Jinja environment on first use, shared by every template"""
+    # Jinja is only imported when a report is actually rendered
+    from jinja2 import Environment, select_autoescape
+    return Environment(autoescape=select_autoescape(["html"]))
+
+
+@lru_cache(maxsize=None)
+def _html_template() -> "Template":
+    """Compile the HTML report body template once per process"""
+    return _jinja_env().from_string(_HTML_BODY_SOURCE)
+
+
+@dataclass(slots=True)
+class Finding:
+    """A single normalized finding reported by one of the scanners"""
+    title: str
+    description: Any
+    severity: str
+    category: str
+    tool: str
+    location: str = ""
+    package: str = ""
+    version: str = ""
+    cve: List[str] = field(default_factory=list)
+    rule_id: str = ""
+    resource: str = ""
+    file: str = ""
+    namespace: str = ""
+    line: Union[int, str] = ""
+    test_number: str = ""
+
+
+_FINDING_FIELDS = tuple(f.name for f in fields(Finding))
+
+# A scan artifact path, the processor for its format and its error label
+Artifact = Tuple[Path, Callable[[Any], List[Finding]], str]
+
+# Findings loaded from an artifact along with the errors it ran into
+LoadResult = Tuple[List[Finding], List[str]]
+
 
 class SecurityReportGenerator:
-    def __init__(self):
+    __slots__ = (
+        "scan_results_dir",
+        "cache_dir",
+        "_present",
+        "_cache_used",
+        "_by_category",
+        "_title_has_data",
+        "_seen",
+        "report_data"
+    )
+    
+    def __init__(self) -> None:
         self.scan_results_dir = Path("scan-results")
-        self.report_data = {
+        self.cache_dir = Path(".security-report-cache")
+        # Every file under scan_results_dir, collected in one directory walk
+        self._present: Set[Path] = set()
+        # Cache entries read or written by this run; the rest are pruned
+        self._cache_used: Set[str] = set()
+        # Indexes maintained by _add_finding so report generation does not
+        # have to rescan every finding
+        self._by_category: Dict[str, List[Finding]] = defaultdict(list)
+        self._title_has_data = 0
+        # Keys of dependency findings already added, used to drop duplicates
+        self._seen: Set[Tuple[Any, ...]] = set()
+        self.report_data: Dict[str, Any] = {
             "summary": {"critical": 0, "high": 0, "medium": 0, "low": 0},
             "findings": [],
-            "critical_findings": [],
-            "high_findings": [],
-            "medium_findings": [],
-            "low_findings": [],
             "recommendations": [],
             "compliance_status": {},
             "scan_metadata": {
@@ -38,222 +244,240 @@ class SecurityReportGenerator:
             print("No scan results directory found")
             return
         
-        # Load container vulnerability results
-        self._load_trivy_results()
-        self._load_snyk_results()
-        self._load_npm_audit_results()
-        self._load_secrets_results()
-        self._load_infrastructure_results()
-        self._load_kubernetes_results()
-        self._load_compliance_results()
-        self._load_sast_results()
-        self._load_license_results()
-    
-    def _load_trivy_results(self) -> None:
-        """Load Trivy container scan results"""
-        trivy_file = self.scan_results_dir / "trivy-results.sarif"
-        if trivy_file.exists():
-            try:
-                with open(trivy_file, 'r') as f:
-                    trivy_data = json.load(f)
-                
-                for run in trivy_data.get("runs", []):
-                    for result in run.get("results", []):
-                        severity = result.get("level", "warning").upper()
-                        self._add_finding({
-                            "title": result.get("message", {}).get("text", "Unknown"),
-                            "description": result.get("message", {}).get("text", ""),
-                            "severity": severity,
-                            "category": "Container Vulnerability",
-                            "tool": "Trivy",
-                            "location": result.get("locations", [{}])[0].get("physicalLocation", {}).get("artifactLocation", {}).get("uri", ""),
-                            "rule_id": result.get("ruleId", "")
-                        })
-            except Exception as e:
-                print(f"Error loading Trivy results: {e}")
-    
-    def _load_snyk_results(self) -> None:
-        """Load Snyk scan results"""
-        snyk_files = [
-            self.scan_results_dir / "snyk-container-results" / "snyk-container-results.json",
-            self.scan_results_dir / "dependency-scan-results" / "snyk-dependency-results.json"
-        ]
+        # One walk of the artifacts tree replaces a stat() per candidate file
+        self._present = {
+            Path(root) / name
+            for root, _, names in os.walk(self.scan_results_dir)
+            for name in names
+        }
         
-        for snyk_file in snyk_files:
-            if snyk_file.exists():
-                try:
-                    with open(snyk_file, 'r') as f:
-                        snyk_data = json.load(f)
-                    
-                    for vuln in snyk_data.get("vulnerabilities", []):
-                        severity = vuln.get("severity", "medium").upper()
-                        self._add_finding({
-                            "title": vuln.get("title", "Unknown"),
-                            "description": vuln.get("description", ""),
-                            "severity": severity,
-                            "category": "Dependency Vulnerability",
-                            "tool": "Snyk",
-                            "package": vuln.get("packageName", ""),
-                            "version": vuln.get("version", ""),
-                            "cve": vuln.get("identifiers", {}).get("CVE", [])
-                        })
-                except Exception as e:
-                    print(f"Error loading Snyk results: {e}")
-    
-    def _load_npm_audit_results(self) -> None:
-        """Load npm audit results"""
-        npm_audit_file = self.scan_results_dir / "dependency-scan-results" / "npm-audit-results.json"
-        if npm_audit_file.exists():
-            try:
-                with open(npm_audit_file, 'r') as f:
-                    npm_data = json.load(f)
-                
-                for vuln in npm_data.get("vulnerabilities", {}).values():
-                    severity = vuln.get("severity", "medium").upper()
-                    self._add_finding({
-                        "title": vuln.get("title", "Unknown"),
-                        "description": vuln.get("description", ""),
-                        "severity": severity,
-                        "category": "Dependency Vulnerability",
-                        "tool": "npm audit",
-                        "package": vuln.get("name", ""),
-                        "version": vuln.get("version", ""),
-                        "cve": vuln.get("cves", [])
-                    })
-            except Exception as e:
-                print(f"Error loading npm audit results: {e}")
-    
-    def _load_secrets_results(self) -> None:
-        """Load secrets detection results"""
-        # This would load results from TruffleHog, GitGuardian, etc.
-        # Implementation depends on the specific output format
-        pass
-    
-    def _load_infrastructure_results(self) -> None:
-        """Load infrastructure security scan results"""
-        infra_files = [
-            self.scan_results_dir / "infrastructure-scan-results" / "checkov-results.json",
-            self.scan_results_dir / "infrastructure-scan-results" / "tfsec-results.json",
-            self.scan_results_dir / "infrastructure-scan-results" / "terrascan-results.json"
-        ]
+        artifacts = self._scan_artifacts()
         
-        for infra_file in infra_files:
-            if infra_file.exists():
-                try:
-                    with open(infra_file, 'r') as f:
-                        infra_data = json.load(f)
-                    
-                    # Process based on tool-specific format
-                    if "checkov" in infra_file.name:
-                        self._process_checkov_results(infra_data)
-                    elif "tfsec" in infra_file.name:
-                        self._process_tfsec_results(infra_data)
-                    elif "terrascan" in infra_file.name:
-                        self._process_terrascan_results(infra_data)
-                except Exception as e:
-                    print(f"Error loading infrastructure results: {e}")
-    
-    def _load_kubernetes_results(self) -> None:
-        """Load Kubernetes security scan results"""
-        k8s_files = [
-            self.scan_results_dir / "kubernetes-scan-results" / "polaris-results.json",
-            self.scan_results_dir / "kubernetes-scan-results" / "kube-bench-results.json"
-        ]
+        # Every artifact is read and parsed in its own task, so all file reads
+        # are in flight at once. Findings are merged and errors printed here
+        # on the main thread in the fixed artifact order
+        with ThreadPoolExecutor(max_workers=max(len(artifacts), 1)) as executor:
+            futures = [
+                executor.submit(self._load_artifact, path, process, label)
+                for path, process, label in artifacts
+            ]
+            for future in futures:
+                findings, errors = future.result()
+                for error in errors:
+                    print(error)
+                for finding in findings:
+                    self._add_finding(finding)
         
-        for k8s_file in k8s_files:
-            if k8s_file.exists():
+        self._prune_cache()
+    
+    def _prune_cache(self) -> None:
+        """Delete cache entries for artifacts this run no longer has"""
+        if not self.cache_dir.is_dir():
+            return
+        for entry in self.cache_dir.iterdir():
+            if entry.is_file() and entry.name not in self._cache_used:
                 try:
-                    with open(k8s_file, 'r') as f:
-                        k8s_data = json.load(f)
-                    
-                    if "polaris" in k8s_file.name:
-                        self._process_polaris_results(k8s_data)
-                    elif "kube-bench" in k8s_file.name:
-                        self._process_kubebench_results(k8s_data)
-                except Exception as e:
-                    print(f"Error loading Kubernetes results: {e}")
-    
-    def _load_compliance_results(self) -> None:
-        """Load compliance audit results"""
-        compliance_files = [
-            self.scan_results_dir / "compliance-audit-results" / "bandit-results.json",
-            self.scan_results_dir / "compliance-audit-results" / "semgrep-results.json"
+                    entry.unlink()
+                except OSError as e:
+                    print(f"Could not prune cache entry {entry}: {e}")
+    
+    def _scan_artifacts(self) -> List[Artifact]:
+        """List the scan artifacts present, with their processor and label"""
+        results = self.scan_results_dir
+        candidates: List[Artifact] = [
+            # Container vulnerability results
+            (results / "trivy-results.sarif", self._process_trivy_results, "Trivy"),
+            (results / "snyk-container-results" / "snyk-container-results.json", self._process_snyk_results, "Snyk"),
+            # Dependency vulnerability results
+            (results / "dependency-scan-results" / "snyk-dependency-results.json", self._process_snyk_results, "Snyk"),
+            (results / "dependency-scan-results" / "npm-audit-results.json", self._process_npm_audit_results, "npm audit"),
+            # Secrets detection results (TruffleHog, GitGuardian, etc.) would
+            # go here once their output format is settled
+            # Infrastructure security results
+            (results / "infrastructure-scan-results" / "checkov-results.json", self._process_checkov_results, "infrastructure"),
+            (results / "infrastructure-scan-results" / "tfsec-results.json", self._process_tfsec_results, "infrastructure"),
+            (results / "infrastructure-scan-results" / "terrascan-results.json", self._process_terrascan_results, "infrastructure"),
+            # Kubernetes security results
+            (results / "kubernetes-scan-results" / "polaris-results.json", self._process_polaris_results, "Kubernetes"),
+            (results / "kubernetes-scan-results" / "kube-bench-results.json", self._process_kubebench_results, "Kubernetes"),
+            # Compliance audit results
+            (results / "compliance-audit-results" / "bandit-results.json", self._process_bandit_results, "compliance"),
+            (results / "compliance-audit-results" / "semgrep-results.json", self._process_semgrep_results, "compliance"),
+            # SAST and license compliance results
+            (results / "sast-scan-results" / "eslint-security-results.json", self._process_eslint_results, "SAST"),
+            (results / "license-compliance-results" / "license-checker-results.json", self._process_license_results, "license")
         ]
-        
-        for compliance_file in compliance_files:
-            if compliance_file.exists():
-                try:
-                    with open(compliance_file, 'r') as f:
-                        compliance_data = json.load(f)
-                    
-                    if "bandit" in compliance_file.name:
-                        self._process_bandit_results(compliance_data)
-                    elif "semgrep" in compliance_file.name:
-                        self._process_semgrep_results(compliance_data)
-                except Exception as e:
-                    print(f"Error loading compliance results: {e}")
-    
-    def _load_sast_results(self) -> None:
-        """Load SAST scan results"""
-        sast_file = self.scan_results_dir / "sast-scan-results" / "eslint-security-results.json"
-        if sast_file.exists():
+        return [artifact for artifact in candidates if artifact[0] in self._present]
+    
+    def _load_artifact(self, path: Path, process: Callable[[Any], List[Finding]], label: str) -> LoadResult:
+        """Load the findings of one scan artifact"""
+        findings: List[Finding] = []
+        errors: List[str] = []
+        try:
+            findings = self._cached_load(path, process, errors)
+        except Exception as e:
+            errors.append(f"Error loading {label} results: {e}")
+        return findings, errors
+    
+    def _cached_load(self, path: Path, process: Callable[[Any], List[Finding]], errors: List[str]) -> List[Finding]:
+        """Parse a scan artifact, reusing findings cached from a previous run"""
+        raw = path.read_bytes()
+        # Key on the artifact's contents so a rewritten file is never matched
+        # to stale findings; hashing is cheap next to parsing
+        key = hashlib.blake2b(digest_size=16)
+        key.update(f"{_SCRIPT_DIGEST}:{path}:".encode())
+        key.update(raw)
+        cache_file = self.cache_dir / key.hexdigest()
+        self._cache_used.add(cache_file.name)
+        # The cache is only an optimization, so an unreadable entry falls back
+        # to parsing the artifact and a failed write still returns findings
+        if cache_file.exists():
             try:
-                with open(sast_file, 'r') as f:
-                    sast_data = json.load(f)
-                
-                for result in sast_data:
-                    severity = self._map_eslint_severity(result.get("severity", 1))
-                    self._add_finding({
-                        "title": result.get("ruleId", "Unknown"),
-                        "description": result.get("message", ""),
-                        "severity": severity,
-                        "category": "SAST",
-                        "tool": "ESLint Security",
-                        "location": result.get("filePath", ""),
-                        "line": result.get("line", "")
-                    })
+                return [Finding(**cached) for cached in _loads(cache_file.read_bytes())]
             except Exception as e:
-                print(f"Error loading SAST results: {e}")
+                errors.append(f"Ignoring unreadable cache entry for {path}: {e}")
+        
+        findings = process(_parse_json(raw))
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            # Write through a temporary file so a crash never leaves a
+            # half-written entry behind
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_dumps(findings))
+                os.replace(tmp_name, cache_file)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except Exception as e:
+            errors.append(f"Could not cache findings for {path}: {e}")
+        return findings
+    
+    def _process_trivy_results(self, data: Dict[str, Any]) -> List[Finding]:
+        """Process Trivy SARIF results"""
+        findings: List[Finding] = []
+        append = findings.append
+        for run in data.get("runs", []):
+            for result in run.get("results", []):
+                severity = result.get("level", "warning").upper()
+                message = result.get("message", {})
+                # Index straight into the SARIF location rather than
+                # allocating empty fallbacks at every level of the chain
+                try:
+                    location = result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]
+                except (KeyError, IndexError, TypeError):
+                    location = ""
+                append(Finding(
+                    title=message.get("text", "Unknown"),
+                    description=message.get("text", ""),
+                    severity=severity,
+                    category="Container Vulnerability",
+                    tool="Trivy",
+                    location=location,
+                    rule_id=result.get("ruleId", "")
+                ))
+        return findings
     
-    def _load_license_results(self) -> None:
-        """Load license compliance results"""
-        license_file = self.scan_results_dir / "license-compliance-results" / "license-checker-results.json"
-        if license_file.exists():
+    def _process_snyk_results(self, data: Dict[str, Any]) -> List[Finding]:
+        """Process Snyk scan results"""
+        findings: List[Finding] = []
+        append = findings.append
+        for vuln in data.get("vulnerabilities", []):
+            severity = vuln.get("severity", "medium").upper()
             try:
-                with open(license_file, 'r') as f:
-                    license_data = json.load(f)
-                
-                # Process license compliance issues
-                for package, info in license_data.items():
-                    if "license" not in info or info["license"] == "UNKNOWN":
-                        self._add_finding({
-                            "title": f"Unknown license for {package}",
-                            "description": f"Package {package} has an unknown or missing license",
-                            "severity": "MEDIUM",
-                            "category": "License Compliance",
-                            "tool": "license-checker",
-                            "package": package
-                        })
-            except Exception as e:
-                print(f"Error loading license results: {e}")
+                cve = _export(vuln["identifiers"]["CVE"])
+            except (KeyError, TypeError):
+                cve = []
+            append(Finding(
+                title=vuln.get("title", "Unknown"),
+                description=vuln.get("description", ""),
+                severity=severity,
+                category="Dependency Vulnerability",
+                tool="Snyk",
+                package=vuln.get("packageName", ""),
+                version=vuln.get("version", ""),
+                cve=cve
+            ))
+        return findings
+    
+    def _process_npm_audit_results(self, data: Dict[str, Any]) -> List[Finding]:
+        """Process npm audit results"""
+        findings: List[Finding] = []
+        append = findings.append
+        for _, vuln in data.get("vulnerabilities", {}).items():
+            severity = vuln.get("severity", "medium").upper()
+            append(Finding(
+                title=vuln.get("title", "Unknown"),
+                description=vuln.get("description", ""),
+                severity=severity,
+                category="Dependency Vulnerability",
+                tool="npm audit",
+                package=vuln.get("name", ""),
+                version=vuln.get("version", ""),
+                cve=_export(vuln.get("cves", []))
+            ))
+        return findings
+    
+    def _process_eslint_results(self, data: List[Dict[str, Any]]) -> List[Finding]:
+        """Process ESLint security results"""
+        findings: List[Finding] = []
+        append = findings.append
+        for result in data:
+            severity = self._map_eslint_severity(result.get("severity", 1))
+            append(Finding(
+                title=result.get("ruleId", "Unknown"),
+                description=result.get("message", ""),
+                severity=severity,
+                category="SAST",
+                tool="ESLint Security",
+                location=result.get("filePath", ""),
+                line=result.get("line", "")
+            ))
+        return findings
     
-    def _add_finding(self, finding: Dict[str, Any]) -> None:
+    def _process_license_results(self, data: Dict[str, Any]) -> List[Finding]:
+        """Process license-checker results"""
+        findings: List[Finding] = []
+        # Process license compliance issues
+        append = findings.append
+        for package, info in data.items():
+            if "license" not in info or info["license"] == "UNKNOWN":
+                append(Finding(
+                    title=f"Unknown license for {package}",
+                    description=f"Package {package} has an unknown or missing license",
+                    severity="MEDIUM",
+                    category="License Compliance",
+                    tool="license-checker",
+                    package=package
+                ))
+        return findings
+    
+    def _add_finding(self, finding: Finding) -> None:
         """Add a finding to the report"""
+        # Only dependency scanners overlap (the Snyk container and dependency
+        # runs, npm audit), and their findings carry the package, version
+        # and CVEs that identify them. Other tools can report distinct
+        # issues that differ only in details Finding does not keep
+        if finding.category == "Dependency Vulnerability":
+            key = tuple(
+                repr(value) if isinstance(value, (list, dict)) else value
+                for value in (getattr(finding, name) for name in _FINDING_FIELDS)
+            )
+            if key in self._seen:
+                return
+            self._seen.add(key)
+        
         self.report_data["findings"].append(finding)
+        self._by_category[finding.category].append(finding)
+        if "data" in finding.title.lower():
+            self._title_has_data += 1
         
-        severity = finding["severity"]
-        if severity == "CRITICAL":
-            self.report_data["critical_findings"].append(finding)
-            self.report_data["summary"]["critical"] += 1
-        elif severity == "HIGH":
-            self.report_data["high_findings"].append(finding)
-            self.report_data["summary"]["high"] += 1
-        elif severity == "MEDIUM":
-            self.report_data["medium_findings"].append(finding)
-            self.report_data["summary"]["medium"] += 1
-        elif severity == "LOW":
-            self.report_data["low_findings"].append(finding)
-            self.report_data["summary"]["low"] += 1
+        # Findings are stored once; severity buckets are only counted
+        severity = finding.severity.lower()
+        summary = self.report_data["summary"]
+        if severity in summary:
+            summary[severity] += 1
     
     def _map_eslint_severity(self, severity: int) -> str:
         """Map ESLint severity to standard severity levels"""
@@ -264,106 +488,140 @@ class SecurityReportGenerator:
         else:
             return "LOW"
     
-    def _process_checkov_results(self, data: Dict[str, Any]) -> None:
+    def _process_checkov_results(self, data: Dict[str, Any]) -> List[Finding]:
         """Process Checkov scan results"""
+        findings: List[Finding] = []
+        append = findings.append
         for check in data.get("results", {}).get("failed_checks", []):
             severity = check.get("severity", "MEDIUM").upper()
-            self._add_finding({
-                "title": check.get("check_name", "Unknown"),
-                "description": check.get("check_result", {}).get("evaluated_iam_statement", ""),
-                "severity": severity,
-                "category": "Infrastructure Security",
-                "tool": "Checkov",
-                "resource": check.get("resource", ""),
-                "file": check.get("file_path", "")
-            })
-    
-    def _process_tfsec_results(self, data: Dict[str, Any]) -> None:
+            try:
+                description = _export(check["check_result"]["evaluated_iam_statement"])
+            except (KeyError, TypeError):
+                description = ""
+            append(Finding(
+                title=check.get("check_name", "Unknown"),
+                description=description,
+                severity=severity,
+                category="Infrastructure Security",
+                tool="Checkov",
+                resource=check.get("resource", ""),
+                file=check.get("file_path", "")
+            ))
+        return findings
+    
+    def _process_tfsec_results(self, data: Dict[str, Any]) -> List[Finding]:
         """Process Tfsec scan results"""
+        findings: List[Finding] = []
+        append = findings.append
         for result in data.get("results", []):
             severity = result.get("severity", "MEDIUM").upper()
-            self._add_finding({
-                "title": result.get("rule_id", "Unknown"),
-                "description": result.get("description", ""),
-                "severity": severity,
-                "category": "Infrastructure Security",
-                "tool": "Tfsec",
-                "resource": result.get("resource", ""),
-                "file": result.get("location", {}).get("filename", "")
-            })
-    
-    def _process_terrascan_results(self, data: Dict[str, Any]) -> None:
+            try:
+                file = result["location"]["filename"]
+            except (KeyError, TypeError):
+                file = ""
+            append(Finding(
+                title=result.get("rule_id", "Unknown"),
+                description=result.get("description", ""),
+                severity=severity,
+                category="Infrastructure Security",
+                tool="Tfsec",
+                resource=result.get("resource", ""),
+                file=file
+            ))
+        return findings
+    
+    def _process_terrascan_results(self, data: Dict[str, Any]) -> List[Finding]:
         """Process Terrascan scan results"""
+        findings: List[Finding] = []
+        append = findings.append
         for result in data.get("results", {}).get("violations", []):
             severity = result.get("severity", "MEDIUM").upper()
-            self._add_finding({
-                "title": result.get("rule_name", "Unknown"),
-                "description": result.get("description", ""),
-                "severity": severity,
-                "category": "Infrastructure Security",
-                "tool": "Terrascan",
-                "resource": result.get("resource_type", ""),
-                "file": result.get("file", "")
-            })
-    
-    def _process_polaris_results(self, data: Dict[str, Any]) -> None:
+            append(Finding(
+                title=result.get("rule_name", "Unknown"),
+                description=result.get("description", ""),
+                severity=severity,
+                category="Infrastructure Security",
+                tool="Terrascan",
+                resource=result.get("resource_type", ""),
+                file=result.get("file", "")
+            ))
+        return findings
+    
+    def _process_polaris_results(self, data: Dict[str, Any]) -> List[Finding]:
         """Process Polaris scan results"""
+        findings: List[Finding] = []
+        append = findings.append
         for result in data.get("results", []):
             for check in result.get("checks", []):
                 if check.get("result") == "FAIL":
                     severity = "MEDIUM"  # Polaris doesn't provide severity
-                    self._add_finding({
-                        "title": check.get("name", "Unknown"),
-                        "description": check.get("message", ""),
-                        "severity": severity,
-                        "category": "Kubernetes Security",
-                        "tool": "Polaris",
-                        "resource": result.get("kind", ""),
-                        "namespace": result.get("namespace", "")
-                    })
-    
-    def _process_kubebench_results(self, data: Dict[str, Any]) -> None:
+                    append(Finding(
+                        title=check.get("name", "Unknown"),
+                        description=check.get("message", ""),
+                        severity=severity,
+                        category="Kubernetes Security",
+                        tool="Polaris",
+                        resource=result.get("kind", ""),
+                        namespace=result.get("namespace", "")
+                    ))
+        return findings
+    
+    def _process_kubebench_results(self, data: Dict[str, Any]) -> List[Finding]:
         """Process Kube-bench scan results"""
+        findings: List[Finding] = []
+        append = findings.append
         for test in data.get("tests", []):
             for result in test.get("results", []):
                 if result.get("status") == "FAIL":
                     severity = "MEDIUM"  # Kube-bench doesn't provide severity
-                    self._add_finding({
-                        "title": result.get("test_desc", "Unknown"),
-                        "description": result.get("test_info", ""),
-                        "severity": severity,
-                        "category": "Kubernetes Security",
-                        "tool": "Kube-bench",
-                        "test_number": result.get("test_number", "")
-                    })
-    
-    def _process_bandit_results(self, data: Dict[str, Any]) -> None:
+                    append(Finding(
+                        title=result.get("test_desc", "Unknown"),
+                        description=_export(result.get("test_info", "")),
+                        severity=severity,
+                        category="Kubernetes Security",
+                        tool="Kube-bench",
+                        test_number=result.get("test_number", "")
+                    ))
+        return findings
+    
+    def _process_bandit_results(self, data: Dict[str, Any]) -> List[Finding]:
         """Process Bandit scan results"""
+        findings: List[Finding] = []
+        append = findings.append
         for result in data.get("results", []):
             severity = result.get("issue_severity", "MEDIUM").upper()
-            self._add_finding({
-                "title": result.get("issue_text", "Unknown"),
-                "description": result.get("more_info", ""),
-                "severity": severity,
-                "category": "Code Security",
-                "tool": "Bandit",
-                "file": result.get("filename", ""),
-                "line": result.get("line_number", "")
-            })
-    
-    def _process_semgrep_results(self, data: Dict[str, Any]) -> None:
+            append(Finding(
+                title=result.get("issue_text", "Unknown"),
+                description=result.get("more_info", ""),
+                severity=severity,
+                category="Code Security",
+                tool="Bandit",
+                file=result.get("filename", ""),
+                line=result.get("line_number", "")
+            ))
+        return findings
+    
+    def _process_semgrep_results(self, data: Dict[str, Any]) -> List[Finding]:
         """Process Semgrep scan results"""
+        findings: List[Finding] = []
+        append = findings.append
         for result in data.get("results", []):
-            severity = result.get("extra", {}).get("severity", "MEDIUM").upper()
-            self._add_finding({
-                "title": result.get("check_id", "Unknown"),
-                "description": result.get("extra", {}).get("message", ""),
-                "severity": severity,
-                "category": "Code Security",
-                "tool": "Semgrep",
-                "file": result.get("path", ""),
-                "line": result.get("start", {}).get("line", "")
-            })
+            extra = result.get("extra", {})
+            severity = extra.get("severity", "MEDIUM").upper()
+            try:
+                line = result["start"]["line"]
+            except (KeyError, TypeError):
+                line = ""
+            append(Finding(
+                title=result.get("check_id", "Unknown"),
+                description=extra.get("message", ""),
+                severity=severity,
+                category="Code Security",
+                tool="Semgrep",
+                file=result.get("path", ""),
+                line=line
+            ))
+        return findings
     
     def generate_recommendations(self) -> None:
         """Generate security recommendations based on findings"""
@@ -380,14 +638,12 @@ class SecurityReportGenerator:
             recommendations.append("Implement additional security controls for high-risk areas")
         
         # Infrastructure recommendations
-        infra_findings = [f for f in self.report_data["findings"] if "Infrastructure" in f["category"]]
-        if infra_findings:
+        if self._by_category.get("Infrastructure Security"):
             recommendations.append("Review and update infrastructure security configurations")
             recommendations.append("Implement least-privilege access controls")
         
         # Kubernetes recommendations
-        k8s_findings = [f for f in self.report_data["findings"] if "Kubernetes" in f["category"]]
-        if k8s_findings:
+        if self._by_category.get("Kubernetes Security"):
             recommendations.append("Apply Kubernetes security best practices and CIS benchmarks")
             recommendations.append("Enable Pod Security Policies and Network Policies")
         
@@ -404,13 +660,15 @@ class SecurityReportGenerator:
     
     def generate_compliance_status(self) -> None:
         """Generate compliance status report"""
+        # Every check reads a counter or index kept by _add_finding
+        critical_status = "PASS" if self.report_data["summary"]["critical"] == 0 else "FAIL"
         compliance_status = {
-            "overall_status": "PASS" if self.report_data["summary"]["critical"] == 0 else "FAIL",
+            "overall_status": critical_status,
             "standards": {
-                "OWASP Top 10": "PASS" if self.report_data["summary"]["critical"] == 0 else "FAIL",
-                "CIS Benchmarks": "PASS" if len([f for f in self.report_data["findings"] if "Kubernetes" in f["category"]]) == 0 else "FAIL",
-                "SOC 2": "PASS" if self.report_data["summary"]["critical"] == 0 else "FAIL",
-                "GDPR": "PASS" if len([f for f in self.report_data["findings"] if "data" in f["title"].lower()]) == 0 else "FAIL"
+                "OWASP Top 10": critical_status,
+                "CIS Benchmarks": "FAIL" if self._by_category.get("Kubernetes Security") else "PASS",
+                "SOC 2": critical_status,
+                "GDPR": "PASS" if self._title_has_data == 0 else "FAIL"
             },
             "last_updated": datetime.now().isoformat()
         }
@@ -424,8 +682,11 @@ class SecurityReportGenerator:
         self.generate_compliance_status()
         
         # Generate JSON report
-        with open("security-report.json", "w") as f:
-            json.dump(self.report_data, f, indent=2)
+        if orjson is not None:
+            Path("security-report.json").write_bytes(orjson.dumps(self.report_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open("security-report.json", "w") as f:
+                json.dump(self.report_data, f, indent=2, default=asdict)
         
         # Generate HTML report
         self._generate_html_report()
@@ -438,101 +699,19 @@ class SecurityReportGenerator:
     
     def _generate_html_report(self) -> None:
         """Generate HTML security report"""
-        html_template = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>CodePal Security Report</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        .header { background: #f5f5f5; padding: 20px; border-radius: 5px; }
-        .summary { display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px; margin: 20px 0; }
-        .summary-card { background: #fff; padding: 20px; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .critical { border-left: 5px solid #dc3545; }
-        .high { border-left: 5px solid #fd7e14; }
-        .medium { border-left: 5px solid #ffc107; }
-        .low { border-left: 5px solid #28a745; }
-        .findings { margin: 20px 0; }
-        .finding { background: #fff; padding: 15px; margin: 10px 0; border-radius: 5px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }
-        .recommendations { background: #e7f3ff; padding: 20px; border-radius: 5px; margin: 20px 0; }
-        .compliance { background: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🔒 CodePal Security Report</h1>
-        <p>Generated on: {{ scan_metadata.generated_at }}</p>
-        <p>Project: {{ scan_metadata.project }} v{{ scan_metadata.version }}</p>
-    </div>
-    
-    <div class="summary">
-        <div class="summary-card critical">
-            <h3>Critical</h3>
-            <h2>{{ summary.critical }}</h2>
-        </div>
-        <div class="summary-card high">
-            <h3>High</h3>
-            <h2>{{ summary.high }}</h2>
-        </div>
-        <div class="summary-card medium">
-            <h3>Medium</h3>
-            <h2>{{ summary.medium }}</h2>
-        </div>
-        <div class="summary-card low">
-            <h3>Low</h3>
-            <h2>{{ summary.low }}</h2>
-        </div>
-    </div>
-    
-    <div class="compliance">
-        <h2>Compliance Status</h2>
-        <p><strong>Overall Status:</strong> {{ compliance_status.overall_status }}</p>
-        {% for standard, status in compliance_status.standards.items() %}
-        <p><strong>{{ standard }}:</strong> {{ status }}</p>
-        {% endfor %}
-    </div>
-    
-    <div class="findings">
-        <h2>Security Findings</h2>
-        {% for finding in findings %}
-        <div class="finding {{ finding.severity.lower() }}">
-            <h4>{{ finding.title }}</h4>
-            <p><strong>Severity:</strong> {{ finding.severity }}</p>
-            <p><strong>Category:</strong> {{ finding.category }}</p>
-            <p><strong>Tool:</strong> {{ finding.tool }}</p>
-            <p>{{ finding.description }}</p>
-        </div>
-        {% endfor %}
-    </div>
-    
-    <div class="recommendations">
-        <h2>Recommendations</h2>
-        <ul>
-        {% for recommendation in recommendations %}
-            <li>{{ recommendation }}</li>
-        {% endfor %}
-        </ul>
-    </div>
-</body>
-</html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(**self.report_data)
-        
-        with open("security-report.html", "w") as f:
-            f.write(html_content)
+        with open("security-report.html", "wb") as f:
+            f.write(_HTML_PREFIX)
+            # Streamed so the rendered report is never held in memory whole
+            _html_template().stream(**self.report_data).dump(f, encoding="utf-8")
+            f.write(_HTML_SUFFIX)
     
     def _generate_pdf_report(self) -> None:
         """Generate PDF security report"""
         try:
-            import weasyprint
-            from weasyprint import HTML
+            from weasyprint import HTML  # type: ignore[import-untyped, import-not-found, unused-ignore]
             
             # Read the HTML file
-            with open("security-report.html", "r") as f:
+            with open("security-report.html", "r", encoding="utf-8") as f:
                 html_content = f.read()
             
             # Generate PDF
@@ -540,7 +719,7 @@ class SecurityReportGenerator:
         except ImportError:
             print("weasyprint not available, skipping PDF generation")
 
-def main():
+def main() -> None:
     """Main function"""
     generator = SecurityReportGenerator()
     